@@ -1,152 +1,235 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import math
 import numpy as np
-from scipy import integrate
-from scipy.special import j0
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from PIL import Image, ImageTk
+from numba import njit
 from datetime import datetime
-
-#from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from functools import lru_cache
+from typing import NamedTuple
+
+C = 3e8  # скорость света в м/с
+_INV_120_PI2 = 1 / (120 * math.pi ** 2)  # нормировка проводимостей щели
+
+@njit(inline='always', cache=True, fastmath=True)
+def _j0_fast(x):
+    """Функция Бесселя J0 (Абрамовиц, Стиган 9.4.1, 9.4.3), погрешность < 1e-7"""
+
+    ax = abs(x)
+    if ax <= 3.0:
+        y = (ax / 3.0) ** 2
+        return (1.0 + y * (-2.2499997 + y * (1.2656208 + y * (-0.3163866
+                + y * (0.0444479 + y * (-0.0039444 + y * 0.0002100))))))
+
+    y = 3.0 / ax
+    f0 = (0.79788456 + y * (-0.00000077 + y * (-0.00552740 + y * (-0.00009512
+          + y * (0.00137237 + y * (-0.00072805 + y * 0.00014476))))))
+    theta0 = (ax - 0.78539816 + y * (-0.04166397 + y * (-0.00003954 + y * (0.00262573
+              + y * (-0.00054125 + y * (-0.00029333 + y * 0.00013558))))))
+    return f0 * math.cos(theta0) / math.sqrt(ax)
+
+@njit(cache=True, fastmath=True)
+def _patch_width(lambda_0, epsilon_r):
+    """Ширина патча"""
+
+    W = (lambda_0 / 2) * math.sqrt(2 / (epsilon_r + 1))
+    return W
+
+@njit(cache=True, fastmath=True)
+def _effective_permittivity(epsilon_r, h, W):
+    """Эффективная диэлектрическая проницаемость"""
+
+    term = 1 / math.sqrt(1 + 12 * (h / W))
+    epsilon_ref = ((epsilon_r + 1) / 2 + (epsilon_r - 1) / 2 * term)
+    return epsilon_ref
+
+@njit(cache=True, fastmath=True)
+def _patch_length(Leff, epsilon_ref, h, W):
+    """Длина патча"""
+
+    term2_numerator = (epsilon_ref + 0.3) * (W / h + 0.264)
+    term2_denominator = (epsilon_ref - 0.258) * (W / h + 0.8)
+    term2 = 0.824 * h * (term2_numerator / term2_denominator)
+
+    L = Leff - term2
+    return L
+
+@njit(cache=True, fastmath=True)
+def _conductances(W, L, k0, sin_theta, cos_theta, sin3_theta, w_theta):
+    """Проводимости излучающей щели и взаимная проводимость"""
+
+    # Подынтегральные функции гладкие на [0, pi] - достаточно квадратуры Гаусса-Лежандра.
+    # Оба интеграла считаются за один проход по узлам
+    half_k0W = k0 * W / 2
+    k0L = k0 * L
+    G1 = 0.0
+    G12 = 0.0
+    for i in range(sin_theta.size):
+        c = cos_theta[i]
+        num = math.sin(half_k0W * c)
+        base = (num * num) / (c * c) * sin3_theta[i] * w_theta[i]
+        G1 += base
+        G12 += base * _j0_fast(k0L * sin_theta[i])
+
+    G1 *= _INV_120_PI2
+    G12 *= _INV_120_PI2
+
+    return max(G1, 1e-12), max(G12, 1e-12)
+
+@njit(cache=True, fastmath=True)
+def _input_impedance_edge(G1, G12):
+    """Входное сопротивление на краю"""
+
+    R_in = 1 / (2 * (G1 + G12))
+    return R_in
+
+@njit(cache=True, fastmath=True)
+def _feed_position(R_in_edge, L):
+    """Положение точки питания"""
+
+    # Если сопротивление на краю меньше 50 Ом, аргумент ограничивается единицей
+    # и arccos(1) = 0 - питаем с края
+    return (L / np.pi) * math.acos(math.sqrt(min(1.0, 50.0 / R_in_edge)))
+
+@njit(cache=True, fastmath=True)
+def _directivity(W, k0, Leff, sin_theta, cos_theta, sin3_theta, w_theta):
+    """Направленность: интеграл по phi взят аналитически, по theta - квадратура Гаусса-Лежандра"""
+
+    # Интеграл по phi берется аналитически:
+    # cos^2(x) = (1 + cos(2x)) / 2, интеграл от 0 до pi cos(2B sin(phi)) dphi = pi * J0(2B).
+    # Численное интегрирование по theta за один проход по узлам
+    half_k0W = k0 * W / 2
+    k0Leff = k0 * Leff
+    I1 = 0.0
+    for i in range(sin_theta.size):
+        c = cos_theta[i]
+        num = math.sin(half_k0W * c)
+        term1 = (num * num) / (c * c) * sin3_theta[i]
+        inner_phi = 0.5 * np.pi * (1 + _j0_fast(k0Leff * sin_theta[i]))
+        I1 += term1 * inner_phi * w_theta[i]
+
+    # Расчет направленности
+    if I1 > 0:
+        k0W = k0 * W
+        D = k0W * k0W * (np.pi / I1)
+        # Переводим в dBi
+        D_dBi = 10.0 * math.log10(D)
+    else:
+        D_dBi = 0.0
+
+    return D_dBi
+
+@njit(cache=True, fastmath=True)
+def _compute_all(fr, epsilon_r, h, sin_theta, cos_theta, sin3_theta, w_theta):
+    """Полный расчет параметров антенны в скомпилированном коде"""
+
+    # Общие для всех этапов величины считаются один раз
+    lambda_0 = C / fr
+    k0 = 2 * np.pi / lambda_0
+
+    # 1. Расчет ширины патча (W)
+    W = _patch_width(lambda_0, epsilon_r)
+
+    # 2. Расчет эффективной диэлектрической проницаемости
+    epsilon_ref = _effective_permittivity(epsilon_r, h, W)
+
+    # 3. Расчет длины патча (L)
+    Leff = lambda_0 / (2 * math.sqrt(epsilon_ref))
+    L = _patch_length(Leff, epsilon_ref, h, W)
+
+    # 4. Расчет проводимостей и входного сопротивления
+    G1, G12 = _conductances(W, L, k0, sin_theta, cos_theta, sin3_theta, w_theta)
+    R_in_edge = _input_impedance_edge(G1, G12)
+
+    # 5. Расчет точки питания для 50 Ом
+    y0 = _feed_position(R_in_edge, L)
+
+    # 6. Расчет направленности
+    D = _directivity(W, k0, Leff, sin_theta, cos_theta, sin3_theta, w_theta)
+
+    return W, epsilon_ref, L, G1, G12, R_in_edge, y0, D
+
+class AntennaResults(NamedTuple):
+    """Результаты расчета патч-антенны"""
+
+    resonant_frequency: float
+    substrate_permittivity: float
+    substrate_height: float
+    patch_width: float
+    patch_length: float
+    effective_permittivity: float
+    single_slot_conductance: float
+    mutual_conductance: float
+    input_impedance_edge: float
+    feed_position_50ohm: float
+    directivity: float
 
 class MicrostripPatchAntennaCalculator:
     def __init__(self):
-        self.c = 3e8  # скорость света в м/с
+        # Узлы и веса квадратуры Гаусса-Лежандра, перенесенные с [-1, 1] на [0, pi]
+        gl_n, gl_w = np.polynomial.legendre.leggauss(64)
+        theta = 0.5 * np.pi * (gl_n + 1)
+        self._w_theta = 0.5 * np.pi * gl_w
+        self._sin_theta = np.sin(theta)
+        self._cos_theta = np.cos(theta)
+        self._sin3_theta = self._sin_theta ** 3
+
+        # Кэш результатов по (fr, epsilon_r, h) - свой у каждого экземпляра,
+        # чтобы общий кэш класса не удерживал ссылки на калькуляторы
+        self._calculate_antenna_parameters_cached = lru_cache(maxsize=128)(self._compute_antenna_parameters)
 
     def calculate_antenna_parameters(self, fr, epsilon_r, h):
 
         """Расчет параметров микрополосковой патч-антенны по точным формулам"""
 
-        # 1. Расчет ширины патча (W)
-        W = self.calculate_patch_width(fr, epsilon_r)
-
-        # 2. Расчет эффективной диэлектрической проницаемости
-        epsilon_ref = self.calculate_effective_permittivity(epsilon_r, h, W)
-
-        # 3. Расчет длины патча (L)
-        L = self.calculate_patch_length(fr, epsilon_ref, h, W)
-
-        # 4. Расчет проводимостей и входного сопротивления
-        G1, G12 = self.calculate_conductances(W, L, fr)
-        R_in_edge = self.calculate_input_impedance_edge(G1, G12)
-
-        # 5. Расчет точки питания для 50 Ом
-        y0 = self.calculate_feed_position(R_in_edge, L)
-
-        # 6. Расчет направленности
-        D = self.calculate_directivity(W, L, fr, epsilon_ref)
-
-        results = {
-            'resonant_frequency': fr,
-            'substrate_permittivity': epsilon_r,
-            'substrate_height': h,
-            'patch_width': W,
-            'patch_length': L,
-            'effective_permittivity': epsilon_ref,
-            'single_slot_conductance': G1,
-            'mutual_conductance': G12,
-            'input_impedance_edge': R_in_edge,
-            'feed_position_50ohm': y0,
-            'directivity': D,
-        }
+        # Входные значения округляются до 12 значащих цифр - это убирает погрешность float
+        # из ключа кэша; расчет и результат используют округленные значения. Округление
+        # относительное, поэтому малые ненулевые значения (например, h) не обращаются в ноль
+        fr, epsilon_r, h = (float(f"{x:.12g}") for x in (fr, epsilon_r, h))
+        return self._calculate_antenna_parameters_cached(fr, epsilon_r, h)
+
+    def _compute_antenna_parameters(self, fr, epsilon_r, h):
+        """Расчет параметров без кэширования"""
+
+        W, epsilon_ref, L, G1, G12, R_in_edge, y0, D = _compute_all(
+            float(fr), float(epsilon_r), float(h),
+            self._sin_theta, self._cos_theta, self._sin3_theta, self._w_theta)
+
+        results = AntennaResults(
+            resonant_frequency=fr,
+            substrate_permittivity=epsilon_r,
+            substrate_height=h,
+            patch_width=W,
+            patch_length=L,
+            effective_permittivity=epsilon_ref,
+            single_slot_conductance=G1,
+            mutual_conductance=G12,
+            input_impedance_edge=R_in_edge,
+            feed_position_50ohm=y0,
+            directivity=D,
+        )
 
         return results
 
-    def calculate_patch_width(self, fr, epsilon_r):
-        """Ширина патча"""
-
-        W = (self.c / (2 * fr)) * np.sqrt(2 / (epsilon_r + 1))
-        return W
-
-    def calculate_effective_permittivity(self, epsilon_r, h, W):
-        """Эффективная диэлектрическая проницаемость"""
-
-        term = 1 / np.sqrt(1 + 12 * (h / W))
-        epsilon_ref = ((epsilon_r + 1) / 2 + (epsilon_r - 1) / 2 * term)
-        return epsilon_ref
-
-    def calculate_patch_length(self, fr, epsilon_ref, h, W):
-        """Длина патча"""
-
-        term1 = self.c / (2 * fr * np.sqrt(epsilon_ref))
-        term2_numerator = (epsilon_ref + 0.3) * (W / h + 0.264)
-        term2_denominator = (epsilon_ref - 0.258) * (W / h + 0.8)
-        term2 = 0.824 * h * (term2_numerator / term2_denominator)
-
-        L = term1 - term2
-        return L
-
-
-    def calculate_conductances(self, W, L, fr):
-        lambda_0 = self.c / fr
-        k0 = 2 * np.pi / lambda_0
-
-        def integrand_G1(theta):
-            value1 = np.sin((k0 * W / 2) * np.cos(theta)) / np.cos(theta)
-            value = (value1 ** 2) * (np.sin(theta) ** 3)
-            return value
-
-        def integrand_G12(theta):
-            value1 = np.sin((k0 * W / 2) * np.cos(theta)) / np.cos(theta)
-            value = (value1 ** 2) * j0(k0 * L * np.sin(theta)) * (np.sin(theta) ** 3)
-            return value
-
-        G1, _ = integrate.quad(integrand_G1, 0, np.pi)
-        G12, _ = integrate.quad(integrand_G12, 0, np.pi)
-
-        G1 /= (120 * np.pi ** 2)
-        G12 /= (120 * np.pi ** 2)
-
-        return max(G1, 1e-12), max(G12, 1e-12)
-
-
-    def calculate_input_impedance_edge(self, G1, G12):
-        """Входное сопротивление на краю"""
-
-        R_in = 1 / (2 * (G1 + G12))
-        return R_in
-
-    def calculate_feed_position(self, R_in_edge, L):
-        """Положение точки питания"""
-
-        if R_in_edge < 50:
-            # Если сопротивление на краю меньше 50 Ом, питаем с края
-            y0 = 0
-        else:
-            y0 = (L / np.pi) * np.acos(np.sqrt(50 / R_in_edge))
-        return y0 
-
-    def calculate_directivity(self, W, L, fr, epsilon_ref):
-        """Расчет направленности через двойное интегрирование:"""
-
-        lambda_0 = self.c / fr
-        k0 = 2 * np.pi / lambda_0
-
-        # Подынтегральная функция для I1
-        def integrand_I1(theta, phi):
-            value1 = np.sin((k0 * W / 2) * np.cos(theta))/np.cos(theta)
-            term1 = (value1 ** 2) * (np.sin(theta) ** 3)
-
-            Leff = self.c / (2 * fr * np.sqrt(epsilon_ref))
-            term2 = np.cos((k0 * Leff / 2) * np.sin(theta) * np.sin(phi)) ** 2
-
-            return term1 * term2
-
-        # Двойное численное интегрирование
-        I1, error = integrate.dblquad(integrand_I1, 0, np.pi, lambda x: 0, lambda x: np.pi)
-
-        # Расчет направленности
-        if I1 > 0:
-            D = ((2 * np.pi * W) / lambda_0) ** 2 * (np.pi / I1)
-            # Переводим в dBi
-            D_dBi = 10 * np.log10(D)
-        else:
-            D_dBi = 0
-
-        return D_dBi
-
 class MicrostripPatchAntennaCalculatorGUI:
+    # Настройка цветовой схемы для текстовых форматов
+    # font - шрифт, размер, жирный; background - цвет фона; foreground - цвет текста
+    STYLES = {
+        'Custom.TFrame': {'background': '#34495e'},
+        'Title.TLabel': {'font': ('Arial', 18, 'bold'), 'background': '#34495e', 'foreground': 'white'},
+        'Subtitle.TLabel': {'font': ('Arial', 12, 'bold'), 'background': '#34495e', 'foreground': '#ecf0f1'},
+        'Input.TLabel': {'font': ('Arial', 10), 'background': '#34495e', 'foreground': '#bdc3c7'},
+        'ResultTitle.TLabel': {'font': ('Arial', 11, 'bold'), 'background': '#2c3e50', 'foreground': '#3498db'},
+        'ResultValue.TLabel': {'font': ('Arial', 11, 'bold'), 'background': '#2c3e50', 'foreground': '#ecf0f1'},
+        'Unit.TLabel': {'font': ('Arial', 9), 'background': '#2c3e50', 'foreground': '#95a5a6'},
+        'Custom.TButton': {'font': ('Arial', 10, 'bold'), 'background': '#3498db', 'foreground': 'white'},
+        'Input.TEntry': {'fieldbackground': '#ecf0f1', 'foreground': '#2c3e50'},
+        'Custom.TLabelframe': {'background': '#34495e', 'foreground': 'white'},
+        'Custom.TLabelframe.Label': {'background': '#34495e', 'foreground': 'white'},
+    }
+
+    # Загруженное и уменьшенное изображение антенны, общее для всех окон
+    _cached_pil = None
+
     def __init__(self, root):
         self.root = root
         self.root.title("Калькулятор микрополосковой патч-антенны")
@@ -166,22 +249,10 @@ class MicrostripPatchAntennaCalculatorGUI:
         style = ttk.Style() # Объект для управления стилями
         style.theme_use('clam')
 
-        # Настройка цветовой схемы для текстовых форматов
-        # font - шрифт, размер, жирный; background - цвет фона; foreground - цвет текста
-        style.configure('Custom.TFrame', background='#34495e')
-        style.configure('Title.TLabel', font=('Arial', 18, 'bold'), background='#34495e', foreground='white')
-        style.configure('Subtitle.TLabel', font=('Arial', 12, 'bold'), background='#34495e', foreground='#ecf0f1')
-        style.configure('Input.TLabel', font=('Arial', 10), background='#34495e', foreground='#bdc3c7')
-        style.configure('ResultTitle.TLabel', font=('Arial', 11, 'bold'), background='#2c3e50', foreground='#3498db')
-        style.configure('ResultValue.TLabel', font=('Arial', 11, 'bold'), background='#2c3e50', foreground='#ecf0f1')
-        style.configure('Unit.TLabel', font=('Arial', 9), background='#2c3e50', foreground='#95a5a6')
-
-        style.configure('Custom.TButton', font=('Arial', 10, 'bold'), background='#3498db', foreground='white')
-        style.map('Custom.TButton', background=[('active', '#2980b9')]) # Состояние виджета при наведении мышки
+        for name, options in self.STYLES.items():
+            style.configure(name, **options)
 
-        style.configure('Input.TEntry', fieldbackground='#ecf0f1', foreground='#2c3e50')
-        style.configure('Custom.TLabelframe', background='#34495e', foreground='white')
-        style.configure('Custom.TLabelframe.Label', background='#34495e', foreground='white')
+        style.map('Custom.TButton', background=[('active', '#2980b9')]) # Состояние виджета при наведении мышки
 
     def create_widgets(self):
         """Создание интерфейса"""
@@ -237,8 +308,8 @@ class MicrostripPatchAntennaCalculatorGUI:
                 unit_label.grid(row=i * 2 + 1, column=1, sticky='w', padx=(10, 0), pady=(0, 15))
 
         # Кнопка расчета
-        calc_btn = ttk.Button(input_frame, text="ВЫЧИСЛИТЬ ПАРАМЕТРЫ", style='Custom.TButton', command=self.calculate_parameters, width=20)
-        calc_btn.grid(row=6, column=0, columnspan=2, pady=(20, 10), sticky='we')
+        self.calc_btn = ttk.Button(input_frame, text="ВЫЧИСЛИТЬ ПАРАМЕТРЫ", style='Custom.TButton', command=self.calculate_parameters, width=20)
+        self.calc_btn.grid(row=6, column=0, columnspan=2, pady=(20, 10), sticky='we')
 
         # Информация о допустимых диапазонах
         info_text = """
@@ -258,18 +329,23 @@ class MicrostripPatchAntennaCalculatorGUI:
     def setup_image_panel(self, parent):
         """Панель с изображением антенны"""
 
+        # PIL нужен только здесь - импортируем по месту, чтобы не замедлять запуск
+        from PIL import Image, ImageTk
+
         image_frame = ttk.LabelFrame(parent, text="СХЕМА АНТЕННЫ", style='Custom.TLabelframe', padding=20)
         image_frame.pack(side='left', fill='both', expand=True, padx=15)
 
-        # Загружаем изображение
-        pil_image = Image.open("image.png")
+        # Загружаем и масштабируем изображение один раз
+        cls = type(self)
+        if cls._cached_pil is None:
+            pil_image = Image.open("image.png")
 
-        # Масштабируем
-        max_width, max_height = 400, 280
-        pil_image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+            max_width, max_height = 400, 280
+            pil_image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+            cls._cached_pil = pil_image
 
-        # Конвертируем для tkinter
-        self.tk_image = ImageTk.PhotoImage(pil_image)
+        # Конвертируем для tkinter (PhotoImage привязан к своему окну Tk)
+        self.tk_image = ImageTk.PhotoImage(cls._cached_pil)
 
         # Отображаем
         img_label = tk.Label(image_frame, image=self.tk_image, bg='#34495e')
@@ -372,8 +448,6 @@ class MicrostripPatchAntennaCalculatorGUI:
     def calculate_parameters(self):
         """Расчет параметров антенны"""
         try:
-            self.root.update()
-
             # Получение и валидация входных данных
             freq = self.input_vars['freq'].get().strip()
             epsilon = self.input_vars['epsilon'].get().strip()
@@ -393,8 +467,13 @@ class MicrostripPatchAntennaCalculatorGUI:
                 messagebox.showerror("Ошибка", "Все параметры должны быть числами")
                 return
 
-            # Выполнение расчета
-            results = self.calculator.calculate_antenna_parameters(fr, epsilon_r, h)
+            # Выполнение расчета (кнопка заблокирована, пока идет расчет)
+            self.calc_btn.config(state='disabled')
+            self.root.update_idletasks()
+            try:
+                results = self.calculator.calculate_antenna_parameters(fr, epsilon_r, h)
+            finally:
+                self.calc_btn.config(state='normal')
             self.current_results = results
 
             # Обновление интерфейса
@@ -408,14 +487,14 @@ class MicrostripPatchAntennaCalculatorGUI:
         """Обновление отображения результатов"""
         # Форматирование значений
         formatted_results = {
-            'patch_width': f"{results['patch_width'] * 1000:.2f}",
-            'patch_length': f"{results['patch_length'] * 1000:.2f}",
-            'feed_position_50ohm': f"{results['feed_position_50ohm'] * 1000:.2f}",
-            'effective_permittivity': f"{results['effective_permittivity']:.3f}",
-            'input_impedance_edge': f"{results['input_impedance_edge']:.2f}",
-            'single_slot_conductance': f"{results['single_slot_conductance']:.2e}",
-            'mutual_conductance': f"{results['mutual_conductance']:.2e}",
-            'directivity': f"{results['directivity']:.2f}",
+            'patch_width': f"{results.patch_width * 1000:.2f}",
+            'patch_length': f"{results.patch_length * 1000:.2f}",
+            'feed_position_50ohm': f"{results.feed_position_50ohm * 1000:.2f}",
+            'effective_permittivity': f"{results.effective_permittivity:.3f}",
+            'input_impedance_edge': f"{results.input_impedance_edge:.2f}",
+            'single_slot_conductance': f"{results.single_slot_conductance:.2e}",
+            'mutual_conductance': f"{results.mutual_conductance:.2e}",
+            'directivity': f"{results.directivity:.2f}",
         }
 
         # Обновление переменных
@@ -425,38 +504,47 @@ class MicrostripPatchAntennaCalculatorGUI:
 
     def save_results(self):
         """Сохранение результатов в файл"""
-        if not self.current_results:
+        if self.current_results is None:
             messagebox.showwarning("Нет данных", "Сначала выполните расчет")
             return
 
         try:
             filename = f"antenna_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write("=" * 60 + "\n")
-                f.write("РЕЗУЛЬТАТЫ РАСЧЕТА МИКРОПОЛОСКОВОЙ ПАТЧ-АНТЕННЫ\n")
-                f.write("=" * 60 + "\n\n")
-
-                f.write("ВХОДНЫЕ ПАРАМЕТРЫ:\n")
-                f.write("-" * 40 + "\n")
-                f.write(f"Резонансная частота: {self.current_results['resonant_frequency'] / 1e9:.3f} ГГц\n")
-                f.write(f"Диэлектрическая проницаемость: {self.current_results['substrate_permittivity']}\n")
-                f.write(f"Толщина подложки: {self.current_results['substrate_height'] * 1000:.2f} мм\n\n")
-
-                f.write("ГЕОМЕТРИЧЕСКИЕ ПАРАМЕТРЫ:\n")
-                f.write("-" * 40 + "\n")
-                f.write(f"Ширина патча (W): {self.current_results['patch_width'] * 1000:.2f} мм\n")
-                f.write(f"Длина патча (L): {self.current_results['patch_length'] * 1000:.2f} мм\n")
-                f.write(f"Точка питания (y₀): {self.current_results['feed_position_50ohm'] * 1000:.2f} мм\n")
-                f.write(f"Эффективная εr: {self.current_results['effective_permittivity']:.3f}\n\n")
-
-                f.write("ЭЛЕКТРИЧЕСКИЕ ПАРАМЕТРЫ:\n")
-                f.write("-" * 40 + "\n")
-                f.write(f"Сопротивление на краю: {self.current_results['input_impedance_edge']:.2f} Ом\n")
-                f.write(f"Проводимость G₁: {self.current_results['single_slot_conductance']:.2e} См\n")
-                f.write(f"Проводимость G₁₂: {self.current_results['mutual_conductance']:.2e} См\n")
-                f.write(f"Направленность: {self.current_results['directivity']:.2f} dBi\n")
-                f.write("=" * 60 + "\n")
+            r = self.current_results
+            line = "=" * 60
+            sep = "-" * 40
+
+            # Весь отчет собирается в одну строку и записывается одним вызовом
+            report = (
+                f"{line}\n"
+                "РЕЗУЛЬТАТЫ РАСЧЕТА МИКРОПОЛОСКОВОЙ ПАТЧ-АНТЕННЫ\n"
+                f"{line}\n\n"
+
+                "ВХОДНЫЕ ПАРАМЕТРЫ:\n"
+                f"{sep}\n"
+                f"Резонансная частота: {r.resonant_frequency / 1e9:.3f} ГГц\n"
+                f"Диэлектрическая проницаемость: {r.substrate_permittivity}\n"
+                f"Толщина подложки: {r.substrate_height * 1000:.2f} мм\n\n"
+
+                "ГЕОМЕТРИЧЕСКИЕ ПАРАМЕТРЫ:\n"
+                f"{sep}\n"
+                f"Ширина патча (W): {r.patch_width * 1000:.2f} мм\n"
+                f"Длина патча (L): {r.patch_length * 1000:.2f} мм\n"
+                f"Точка питания (y₀): {r.feed_position_50ohm * 1000:.2f} мм\n"
+                f"Эффективная εr: {r.effective_permittivity:.3f}\n\n"
+
+                "ЭЛЕКТРИЧЕСКИЕ ПАРАМЕТРЫ:\n"
+                f"{sep}\n"
+                f"Сопротивление на краю: {r.input_impedance_edge:.2f} Ом\n"
+                f"Проводимость G₁: {r.single_slot_conductance:.2e} См\n"
+                f"Проводимость G₁₂: {r.mutual_conductance:.2e} См\n"
+                f"Направленность: {r.directivity:.2f} dBi\n"
+                f"{line}\n"
+            )
+
+            with open(filename, 'w', encoding='utf-8', buffering=8192) as f:
+                f.write(report)
 
             messagebox.showinfo("Сохранено", f"Результаты сохранены в файл:\n{filename}")
 
@@ -472,4 +560,4 @@ if __name__ == "__main__":
     except ImportError as e:
         print(f"Ошибка импорта: {e}")
         print("Убедитесь, что установлены все зависимости:")
-        print("pip install numpy scipy matplotlib pillow")
\ No newline at end of file
+        print("pip install numpy numba pillow")
\ No newline at end of file